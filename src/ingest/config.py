@@ -12,6 +12,10 @@ MAX_GROOM_ITERATIONS = 30 # one iteration takes about one minute
 
 PARQUET_FILE_MAX_DECISION_RECORDS = 10000
 
+# zstd decompresses several times faster than gzip at a similar ratio and every partition is
+# read back on each groom pass, so the same codec is used for every parquet file written
+PARQUET_COMPRESSION = 'ZSTD'
+
 TRAIN_BUCKET = os.environ['TRAIN_BUCKET']
 
 FIREHOSE_BUCKET = os.environ['FIREHOSE_BUCKET']
@@ -1,3 +1,5 @@
 MODEL_NAME_REGEXP = r"^[a-zA-Z0-9][\w\-.]{0,63}$"
 
 REWARDED_DECISIONS_S3_KEY_REGEXP = r"rewarded_decisions/.+/parquet/\d{4}/\d{2}/\d{2}/\d{8}T\d{6}Z-\d{8}T\d{6}Z-\d+-(.){36}.parquet"
+
+KSUID_REGEXP = r"[0-9A-Za-z]{27}"
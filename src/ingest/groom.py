@@ -1,7 +1,7 @@
 from config import PARQUET_FILE_MAX_DECISION_RECORDS, MAX_GROOM_ITERATIONS
-from datetime import datetime, timedelta
-from partition import RewardedDecisionPartition, list_partition_s3_keys, min_timestamp, max_timestamp, row_count, \
-    min_max_timestamp_row_count, ISO_8601_BASIC_FORMAT
+from datetime import timedelta
+from partition import RewardedDecisionPartition, list_partition_s3_keys, row_count, \
+    min_max_timestamp_row_count, parse_iso_8601_basic_timestamp
 from utils import is_valid_model_name, json_dumps
 
 CHECK_S3_KEYS_FOR_OVRELAPS = True
@@ -69,13 +69,15 @@ def filter_handler(event, context):
     
 
 def assert_no_overlapping_keys(s3_keys):
-    # extract desired data from s3 keys
-    s3_keys_infos = [min_max_timestamp_row_count(s3_key) for s3_key in s3_keys]
+    # extract desired data from s3 keys, parsing each timestamp only once
+    s3_keys_datetimes = [
+        (parse_iso_8601_basic_timestamp(mints), parse_iso_8601_basic_timestamp(maxts))
+        for mints, maxts, _ in map(min_max_timestamp_row_count, s3_keys)]
     # sort keys by max dates ascending
-    sorted_s3_keys_infos = sorted(s3_keys_infos, key=lambda x: datetime.strptime(x[1], ISO_8601_BASIC_FORMAT))
+    sorted_s3_keys_datetimes = sorted(s3_keys_datetimes, key=lambda x: x[1])
 
-    min_datetimes = [datetime.strptime(info[0], ISO_8601_BASIC_FORMAT) for info in sorted_s3_keys_infos]
-    max_datetimes = [datetime.strptime(info[1], ISO_8601_BASIC_FORMAT) for info in sorted_s3_keys_infos]
+    min_datetimes = [min_datetime for min_datetime, _ in sorted_s3_keys_datetimes]
+    max_datetimes = [max_datetime for _, max_datetime in sorted_s3_keys_datetimes]
 
     # timedelta() defaults to 0 seconds
     # if any max datetime is greater than min datetime of next s3 key this is considered an overlap
@@ -103,14 +105,19 @@ def group_partitions_to_groom(s3_keys):
 def group_small_adjacent_partitions(s3_keys, max_row_count=PARQUET_FILE_MAX_DECISION_RECORDS, max_group_size=500):
 
     group = []
+    # keep a running total rather than re-summing the whole group for every key
+    group_row_count = 0
     for s3_key in s3_keys:
-        if sum(map(row_count, group)) + row_count(s3_key) <= max_row_count \
+        s3_key_row_count = row_count(s3_key)
+        if group_row_count + s3_key_row_count <= max_row_count \
         and len(group) < max_group_size:
             group.append(s3_key) # append to the previous group
+            group_row_count += s3_key_row_count
         else:
             if len(group) >= 1: # in case row_count(s3_key) > max_row_count
                 yield group
             group = [s3_key] # create a new group
+            group_row_count = s3_key_row_count
 
     if len(group) >= 1:
         yield group
@@ -120,26 +127,35 @@ def merge_overlapping_adjacent_group_pairs(groups):
     
     # only merge single pairs of groups to keep row_count < max_row_count * 2
     candidate_group = None
+    candidate_max_timestamp = None
 
     for group in groups:
         assert len(group) >= 1
-        
+
+        # a single pass over the group yields both bounds so no s3 key is parsed twice
+        group_min_timestamp, group_max_timestamp = min_max_group_timestamps(group)
+
         if candidate_group:
-            if max(map(max_timestamp, candidate_group)) >= min(map(min_timestamp, group)):
+            if candidate_max_timestamp >= group_min_timestamp:
                 candidate_group.extend(group)
                 yield candidate_group    
                 candidate_group = None # only merge pairs, not unbounded continuous runs of groups
             else:
                 yield candidate_group
-                candidate_group = group
+                candidate_group, candidate_max_timestamp = group, group_max_timestamp
         else:
-            candidate_group = group
+            candidate_group, candidate_max_timestamp = group, group_max_timestamp
 
     # TODO unit test all cases for last candidate groups
     if candidate_group:
         yield candidate_group
         
 
+def min_max_group_timestamps(group):
+    min_timestamps, max_timestamps, _ = zip(*map(min_max_timestamp_row_count, group))
+    return min(min_timestamps), max(max_timestamps)
+
+
 def cap_s3_key_bytes(groups, max_s3_key_bytes=204800):
     s3_key_bytes = 0
     for group in groups:
@@ -1,10 +1,9 @@
-import json
-
 from concurrent.futures import ThreadPoolExecutor
 
 from config import FIREHOSE_BUCKET, S3_CONNECTION_COUNT
 from firehose_record import FirehoseRecordGroup
 from partition import RewardedDecisionPartition
+from utils import json_dumps
 
 
 RECORDS_KEY = 'Records'
@@ -29,7 +28,7 @@ def lambda_handler(event, context):
     Merged partitions containing over 10,000 records will be split into multiple partitions using the logic defined in 
     partition.maybe_split_on_timestamp_boundaries(). 
     """
-    print(f'processing s3 event {json.dumps(event)}')
+    print(f'processing s3 event {json_dumps(event)}')
 
     if not RECORDS_KEY in event or len(event[RECORDS_KEY]) != 1:
         raise Exception('Unexpected s3 event format')
@@ -53,7 +52,12 @@ def lambda_handler(event, context):
     # load the incoming firehose file and group records by model name
     firehose_record_groups = FirehoseRecordGroup.load_groups(s3_key)
 
-    decision_partitions = list(map(lambda x: RewardedDecisionPartition(x.model_name, x.to_pandas_df()), firehose_record_groups))
+    # convert groups one at a time, dropping each group's FirehoseRecords as soon as its DataFrame exists
+    # so that the records of every model and all of the DataFrames are never held in memory together.
+    # Groups are popped straight into to_rewarded_decision_partition() so no local outlives the loop
+    decision_partitions = []
+    while firehose_record_groups:
+        decision_partitions.append(to_rewarded_decision_partition(firehose_record_groups.pop()))
     
     # process each group. consolidate records, upload rewarded decisions to s3
     with ThreadPoolExecutor(max_workers=S3_CONNECTION_COUNT) as executor:
@@ -61,3 +65,6 @@ def lambda_handler(event, context):
     
     return None
 
+
+def to_rewarded_decision_partition(firehose_record_group):
+    return RewardedDecisionPartition(firehose_record_group.model_name, firehose_record_group.to_pandas_df())
@@ -1,5 +1,6 @@
 # Built-in imports
 from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 
 
 # External imports
@@ -11,11 +12,11 @@ from uuid import uuid4
 
 
 # Local imports
-from config import s3client, TRAIN_BUCKET, PARQUET_FILE_MAX_DECISION_RECORDS, S3_CONNECTION_COUNT
+from config import s3client, TRAIN_BUCKET, PARQUET_COMPRESSION, PARQUET_FILE_MAX_DECISION_RECORDS, S3_CONNECTION_COUNT
 from firehose_record import COUNT_KEY, DECISION_ID_KEY, DECISION_ID_COLUMN_INDEX, \
     DF_COLUMNS, DF_SCHEMA, EMPTY_REWARDS_JSON_ENCODED, NO_REWARDS_REWARD_VALUE, \
     NUMERIC_COLUMNS_DTYPE, REWARD_KEY, REWARDS_COLUMN_INDEX, REWARD_COLUMN_INDEX
-from utils import is_valid_ksuid, is_valid_model_name, is_valid_rewarded_decisions_s3_key, json_dumps, list_s3_keys
+from utils import are_valid_ksuids, is_valid_model_name, is_valid_rewarded_decisions_s3_key, json_dumps, list_s3_keys
 
 ISO_8601_BASIC_FORMAT = '%Y%m%dT%H%M%SZ'
 
@@ -82,17 +83,15 @@ class RewardedDecisionPartition:
 
         print(f'writing {sum(map(lambda x: x.shape[0], chunks))} rewarded decisions for {self.model_name} across {len(chunks)} partitions')
         
-        # split the dataframe into multiple chunks if necessary
-        for chunk in chunks:
-            # generate a unique s3 key for this chunk
-            chunk_s3_key = parquet_s3_key(self.model_name, min_decision_id=chunk[DECISION_ID_KEY].iat[0], 
-                max_decision_id=chunk[DECISION_ID_KEY].iat[-1], count=chunk.shape[0])
-                
-            chunk.to_parquet(f's3://{TRAIN_BUCKET}/{chunk_s3_key}', compression='ZSTD', index=False)
+        # each chunk is written to its own s3 key so they can be uploaded concurrently
+        with ThreadPoolExecutor(max_workers=S3_CONNECTION_COUNT) as executor:
+            list(executor.map(lambda x: write_parquet(self.model_name, x), chunks))  # list() forces evaluation of generator
 
     
     def sort(self):
-        self.df.sort_values(DECISION_ID_KEY, inplace=True, ignore_index=True)
+        # the df is a concatenation of already sorted parquet partitions (plus the firehose records),
+        # a stable sort (timsort for object columns) merges those presorted runs instead of re-sorting from scratch
+        self.df.sort_values(DECISION_ID_KEY, inplace=True, ignore_index=True, kind='stable')
         
         self.sorted = True
         
@@ -126,31 +125,26 @@ class RewardedDecisionPartition:
 
         """
         assert self.sorted
-        # create an integer index of df_array, fastest way seems to be np.arange()
-        # remark: tried np.roll() approach - it provides shorter code but is observabluy slower
-        records_indices = np.arange(0, records.shape[0])
-        # create a np array to store operations needed to determine groups starts and ends
-        groups_slices = np.empty((records.shape[0], 3), dtype=object)
-        # cache original decision IDs in the first column
-        groups_slices[:, 0] = records[:, DECISION_ID_COLUMN_INDEX]
-        # 'move down' decision IDs (this creates a 'previous' decision ID column) to be able to compare it with first column
-        groups_slices[1:, 1] = records[:-1, DECISION_ID_COLUMN_INDEX]
-        # 'move up' decision IDs (this creates a 'next' decision ID column) to be able to compare it with first column
-        groups_slices[:-1, 2] = records[1:, DECISION_ID_COLUMN_INDEX]
-
-        # This comparison: groups_slices[:, 0] != groups_slices[:, 1]
-        # creates a boolean mask which shows at which index a group with identical decision ID starts
-        # This comparison: groups_slices[:, 0] != groups_slices[:, 2]
-        # creates a boolean mask which shows at which index a group with identical decision ID ends
-        # records_indices[groups_slices[:, 0] != groups_slices[:, 1]] selects only those indices for which
-        # the logical statement is True -> as a result indices of groups starts are selected
-        # Same approach using groups ends mask allows to select indices at which groups end.
+
+        decision_ids = records[:, DECISION_ID_COLUMN_INDEX]
+        # Compare each decision ID directly with the next one using shifted views rather
+        # than copying 'previous' and 'next' decision ID columns into an N x 3 object array.
+        # is_last_in_group[i] is True if record i ends a group with identical decision ID
+        # (the last record always ends a group).
+        is_last_in_group = np.empty(decision_ids.shape[0], dtype=bool)
+        is_last_in_group[:-1] = decision_ids[:-1] != decision_ids[1:]
+        is_last_in_group[-1:] = True
+
+        # A group starts right after the previous group ends (the first record always starts a group).
+        is_first_in_group = np.empty_like(is_last_in_group)
+        is_first_in_group[1:] = is_last_in_group[:-1]
+        is_first_in_group[:1] = True
+
         # Remark: groups end indicate exact index at which each group ends.
         # python's array sntax <array>[<start>:<end>] will actually return an array until <end> - 1 index
         # which mean that for such array subsetting the last element of each group would be excluded from the subset.
         # In order to avoid this the 'groups ends' must be incremented by one
-        return records_indices[groups_slices[:, 0] != groups_slices[:, 1]], \
-            records_indices[groups_slices[:, 0] != groups_slices[:, 2]] + 1
+        return np.flatnonzero(is_first_in_group), np.flatnonzero(is_last_in_group) + 1
 
     def _merge_many_records_group(
             self, records, records_not_nans_mask, group_slice_start, group_slice_end, into):
@@ -270,31 +264,20 @@ class RewardedDecisionPartition:
     def merge(self):
         # make sure that df is sorted -> this is crucial for current merge() implementation
         assert self.sorted
-        # since records is of object type np.isnan() won't work
-        # an alternative approach is to use elementwise multiplication by 0 which
-        # will make all not nan values become empty strings or 0s while nans will
-        # remain 'untouched'
         # extract numpy array from pandas DF
         records = self.df.values
 
         # Saving file to parquet converts all NaN values in object typed columns to None
         # This means that if a s3 key from train bucket is being merged along with gzipped jsonlines
-        # the self.df contains both NaNs and Nones in object typed columns. This raises problems
-        # with fast missing values mask creation:
-        # - np.isnan() does not work with object dtypes
-        # - None is not of a float type and will cause records * np.full(records.shape, 0) to fail
-        # In order to get the element-wise multiplication to work all Nones must be replaced with np.nans
+        # the self.df contains both NaNs and Nones in object typed columns. Nones are replaced with
+        # np.nans so that merged records consistently use np.nan as the missing value
         if self.s3_keys is not None:
             records[records == None] = np.nan
 
-        # In order to create a boolean mask indicating which cell contains not np.nan value
-        # 2 steps are needed:
-        # - records multiplication by an array full of 0s -> strings will become '', numbers
-        # will become 0 / 0.0 and np.nans will remain np.nans
-        nans_filtering_container = records * np.full(records.shape, 0)
-        # - simple comparison of multiplication result with '' and 0 / 0.0 allows to create a
-        # boolean mask indicating where np.nans are located
-        records_not_nans_mask = (nans_filtering_container == '') + (nans_filtering_container == 0)
+        # since records is of object type np.isnan() won't work. pd.isna() checks
+        # object arrays for None / np.nan in a single compiled pass, without the
+        # temporary arrays an element-wise multiplication by 0 would allocate
+        records_not_nans_mask = ~pd.isna(records)
 
         # Since the df values are sorted by decision ids the df is already grouped.
         # What remains to be determined is finding groups start and end indices
@@ -359,17 +342,25 @@ def read_parquet(s3_key):
     s3_df = pd.read_parquet(f's3://{TRAIN_BUCKET}/{s3_key}', columns=DF_COLUMNS)
 
     # TODO: add more validations
-    valid_idxs = s3_df.decision_id.apply(is_valid_ksuid)
+    valid_idxs = are_valid_ksuids(s3_df.decision_id)
     if not valid_idxs.all():
         unrecoverable_key = f'unrecoverable/{s3_key}'
 
-        s3_df.to_parquet(f's3://{TRAIN_BUCKET}/{unrecoverable_key}', compression='ZSTD')
+        s3_df.to_parquet(f's3://{TRAIN_BUCKET}/{unrecoverable_key}', compression=PARQUET_COMPRESSION)
         
         s3client.delete_object(Bucket=TRAIN_BUCKET, Key=s3_key)
 
         raise IOError(f"Invalid records found in '{s3_key}'. Moved to s3://{TRAIN_BUCKET}/{unrecoverable_key}'")
 
     return s3_df
+
+
+def write_parquet(model_name, chunk):
+    # generate a unique s3 key for this chunk
+    chunk_s3_key = parquet_s3_key(model_name, min_decision_id=chunk[DECISION_ID_KEY].iat[0],
+        max_decision_id=chunk[DECISION_ID_KEY].iat[-1], count=chunk.shape[0])
+
+    chunk.to_parquet(f's3://{TRAIN_BUCKET}/{chunk_s3_key}', compression=PARQUET_COMPRESSION, index=False)
     
     
 def maybe_split_on_timestamp_boundaries(df, max_row_count=PARQUET_FILE_MAX_DECISION_RECORDS):
@@ -391,6 +382,7 @@ def maybe_split_on_timestamp_boundaries(df, max_row_count=PARQUET_FILE_MAX_DECIS
     like O(log(N)) iterations of the grooming process.
     '''
     dfs = [df]
+    timestamps = None
     
     # iterate through different timestamp prefix lengths
     # does not split below 1 second resolution
@@ -398,9 +390,13 @@ def maybe_split_on_timestamp_boundaries(df, max_row_count=PARQUET_FILE_MAX_DECIS
         # if all the dataframes are small enough don't split further
         if all(map(lambda x: x.shape[0] <= max_row_count, dfs)):
             break
+
+        if timestamps is None:
+            # decode each decision_id only once, every prefix length just slices the cached timestamps
+            timestamps = df[DECISION_ID_KEY].map(decision_id_to_timestamp)
         
         # group by timestamp prefixes of length i
-        dfs = [x.reset_index() for _, x in df.set_index(DECISION_ID_KEY).groupby(lambda x: decision_id_to_timestamp(x)[:i])]
+        dfs = [x.reset_index(drop=True) for _, x in df.groupby(timestamps.str[:i])]
     
     return dfs
     
@@ -425,6 +421,20 @@ def max_timestamp(s3_key):
     return maxts
     
     
+def parse_iso_8601_basic_timestamp(timestamp):
+    """
+    Fast path for datetime.strptime(timestamp, ISO_8601_BASIC_FORMAT). The timestamps are always
+    fixed width 'YYYYmmddTHHMMSSZ' strings so slicing avoids strptime's generic format parsing.
+    """
+    # int() tolerates whitespace and signs, so the fields are checked to be plain ASCII digits
+    if len(timestamp) != 16 or timestamp[8] != 'T' or timestamp[15] != 'Z' \
+            or not timestamp.isascii() or not timestamp[:8].isdigit() or not timestamp[9:15].isdigit():
+        raise ValueError(f'invalid timestamp {timestamp}')
+
+    return datetime(int(timestamp[0:4]), int(timestamp[4:6]), int(timestamp[6:8]),
+                    int(timestamp[9:11]), int(timestamp[11:13]), int(timestamp[13:15]))
+
+
 def decision_id_to_timestamp(decision_id):
     return Ksuid.from_base62(decision_id).datetime.strftime(ISO_8601_BASIC_FORMAT)
     
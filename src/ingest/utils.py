@@ -1,16 +1,23 @@
 # Built-in imports
 import datetime
+import functools
 import re
+import time
 
 # External imports
 from ksuid import Ksuid
 import orjson
+import pandas as pd
 
 # Local imports
 from config import s3client
-from constants import MODEL_NAME_REGEXP, REWARDED_DECISIONS_S3_KEY_REGEXP
+from constants import KSUID_REGEXP, MODEL_NAME_REGEXP, REWARDED_DECISIONS_S3_KEY_REGEXP
 
 
+# compiled once at import rather than looked up in re's pattern cache on every call
+_MODEL_NAME_PATTERN = re.compile(MODEL_NAME_REGEXP)
+_REWARDED_DECISIONS_S3_KEY_PATTERN = re.compile(REWARDED_DECISIONS_S3_KEY_REGEXP)
+
 def list_s3_keys(bucket_name, prefix='', after_key=''):
 
     if not isinstance(bucket_name, str) or \
@@ -37,16 +44,25 @@ def get_all_s3_objects(s3, **base_kwargs):
 
 def is_valid_rewarded_decisions_s3_key(s3_key):
     """ Validate if an s3 key complies with the expected format """
-    return bool(re.match(REWARDED_DECISIONS_S3_KEY_REGEXP, s3_key))
+    return bool(_REWARDED_DECISIONS_S3_KEY_PATTERN.match(s3_key))
 
 
 def is_valid_model_name(model_name):   
-    if not isinstance(model_name, str) \
-            or len(model_name) == 0 \
-            or len(model_name) > 64 \
-            or not re.match(MODEL_NAME_REGEXP, model_name):
+    if not isinstance(model_name, str):
         return False
         
+    return _is_valid_model_name_str(model_name)
+
+
+# Every firehose record is validated individually but a file only contains a handful of distinct
+# model names, so the result is cached per name rather than re-running the checks for each record
+@functools.lru_cache(maxsize=1024)
+def _is_valid_model_name_str(model_name):
+    if len(model_name) == 0 \
+            or len(model_name) > 64 \
+            or not _MODEL_NAME_PATTERN.match(model_name):
+        return False
+
     return True
 
     
@@ -63,7 +79,8 @@ def is_valid_ksuid(id_):
         # the performance of the partitions by creating a huge partition in the future
         # that new records keep aggregating into. At some point that partition would
         # no longer fit in RAM and processing could seize.
-        if Ksuid.from_base62(id_).datetime > datetime.datetime.now(datetime.timezone.utc):
+        # Compare plain unix timestamps rather than building two datetime objects per id
+        if Ksuid.from_base62(id_).timestamp > time.time():
             return False
     except:
         # there was an exception parsing the KSUID, fail
@@ -72,6 +89,23 @@ def is_valid_ksuid(id_):
     return True
 
 
+def are_valid_ksuids(ids: pd.Series) -> pd.Series:
+    """
+    Column-wise equivalent of is_valid_ksuid(), validating a whole Series of ids with vectorized string
+    operations instead of decoding every KSUID individually
+    """
+    if pd.api.types.infer_dtype(ids, skipna=False) != 'string':
+        # missing or non string values, validate id by id
+        return ids.map(is_valid_ksuid)
+
+    # base62 is ordered like ASCII, so fixed width KSUID strings sort lexicographically by timestamp.
+    # Any id greater than the largest possible id for the current second is from the future.
+    max_ksuid = str(Ksuid(datetime=datetime.datetime.now(datetime.timezone.utc), payload=b'\xff' * Ksuid.PAYLOAD_LENGTH_IN_BYTES))
+
+    matches_format = ids.str.fullmatch(KSUID_REGEXP)
+    return matches_format & (ids.where(matches_format, '') <= max_ksuid)
+
+
 def json_dumps(val):
     # sorting the json keys may improve compression
     return orjson.dumps(val, option=orjson.OPT_SORT_KEYS).decode("utf-8")
@@ -34,13 +34,12 @@ def unpack(event, context):
         raise ValueError('Missing `Body` in S3 `get_object()` response')
 
     # models_object['Body'] is a 'botocore.response.StreamingBody'
-    # need to call read() on it to access the *.tar.gz file
-    tar_gz_models_buffer = BytesIO(models_object['Body'].read())
+    # open the tar in stream mode ('r|gz') so that members are decompressed while the
+    # body downloads rather than buffering the whole *.tar.gz file in memory first
+    with tarfile.open(fileobj=models_object['Body'], mode='r|gz') as tar_gz_models_file:
 
-    with tarfile.open(fileobj=tar_gz_models_buffer) as tar_gz_models_file:
-        filenames = tar_gz_models_file.getnames()
-
-        for filename in filenames:
+        for model_member in tar_gz_models_file:
+            filename = model_member.name
 
             if filename == 'model.xgb':
                 upload_extension = '.xgb.gz'
@@ -53,7 +52,7 @@ def unpack(event, context):
             key = get_timestamped_s3_key(model_name=s3_model_name, extension=upload_extension)
             latest_key = get_latest_s3_key(model_name=s3_model_name, extension=upload_extension)
 
-            model_member = tar_gz_models_file.getmember(filename)
+            # in stream mode only the current member can be extracted
             model = tar_gz_models_file.extractfile(model_member).read()
 
             upload_model(
@@ -22,4 +22,8 @@ def get_ready_for_benchmark_run():
     os.environ['FIREHOSE_BUCKET'] = 'benchmark-firehose-bucket'
 
     src_abspath = os.sep.join(os.path.abspath('.').split(os.sep)[:-2])
-    sys.path.append(os.sep.join([src_abspath, 'ingest']))
+    ingest_path = os.sep.join([src_abspath, 'ingest'])
+    # append (not insert) so trainer modules keep precedence over ingest's config.py,
+    # and only once so repeated calls don't grow sys.path for every later import lookup
+    if ingest_path not in sys.path:
+        sys.path.append(ingest_path)
@@ -78,10 +78,14 @@ def construct_string_tables(flat_features_bag, allowed_feature_names: list, mode
         if len(sorted_strings) == 0:
             continue
 
+        # the strings only need to be hashed once, each attempt below just masks the full hashes
+        full_hashes = [xxh3(string, model_seed) for string in sorted_strings]
+
         hashes = None
         # there needs to be at least log2(N) bits to uniquely store N entries
         for n_bits in range(max(int(math.log2(len(sorted_strings))),1), 64):
-            hashes = list(map(lambda x: hash(x, n_bits=n_bits, seed=model_seed), sorted_strings))
+            mask = hash_mask(n_bits)
+            hashes = [full_hash & mask for full_hash in full_hashes]
             if len(sorted_strings) == len(set(hashes)):
                 # if the lengths are different there was a collision, add a bit
                 break
@@ -94,11 +98,14 @@ def construct_string_tables(flat_features_bag, allowed_feature_names: list, mode
 
 
 def hash(string: str, n_bits: int, seed: int):
+    return xxh3(string, seed) & hash_mask(n_bits)
+
+
+def hash_mask(n_bits: int):
     # n_bits in current code will never exceed 63
     # assert that n_bits > 0 and n_bits < 64
     assert 0 < n_bits < 64
-    mask = (1 << (n_bits + 1)) - 1
-    return xxh3(string, seed) & mask
+    return (1 << (n_bits + 1)) - 1
 
 
 def get_sorted_strings_by_feature_name(flat_features_bag, prior_mean: float, prior_count: int):
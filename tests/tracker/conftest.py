@@ -54,13 +54,16 @@ class Helpers:
         return FirehoseRecord(x).to_rewarded_decision_dict()
 
 
-@fixture
+# The stateless factory fixtures below are module scoped so that they are built once per test
+# module instead of being re-resolved for every test and case. get_reward_rec keeps a message_id
+# counter, so it and the fixtures depending on it stay function scoped.
+@fixture(scope='module')
 def helpers():
     """ Return a class containing useful helper functions """
     return Helpers
 
 
-@fixture
+@fixture(scope='module')
 def get_record():
     """ A factory fixture.
     Advantages: https://stackoverflow.com/a/51663667/1253729
@@ -110,7 +113,7 @@ def get_record():
     return __get_record
 
 
-@fixture
+@fixture(scope='module')
 def get_decision_rec(get_record):
     """ An fabric of decision records with some known values """
     
@@ -122,7 +125,7 @@ def get_decision_rec(get_record):
     return __dec_rec
 
 
-@fixture
+@fixture(scope='module')
 def get_rewarded_decision_rec(get_decision_rec, helpers):
 
     def __rdr(decision_id='000000000000000000000000000'):
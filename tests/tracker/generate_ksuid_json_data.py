@@ -5,7 +5,6 @@ from datetime import datetime, timezone, timedelta
 import os
 
 # External imports
-from dateutil.parser import parse
 from ksuid import ksuid
 from ksuid.base62 import decodebytes, encodebytes
 from ksuid.ksuid import TIME_STAMP_LENGTH, EPOCH_TIME, BODY_LENGTH
@@ -55,8 +54,8 @@ def get_min_max_datetime(min_or_max):
     a base62-encoded KSUID string, because it may just return one of 
     these:
 
-        MIN_KSUID_DATETIME = parse("2014-05-13T16:53:20+00:00")
-        MAX_KSUID_DATETIME = parse("2150-06-19T23:21:35+00:00")
+        MIN_KSUID_DATETIME = datetime.fromisoformat("2014-05-13T16:53:20+00:00")
+        MAX_KSUID_DATETIME = datetime.fromisoformat("2150-06-19T23:21:35+00:00")
     """
 
     assert min_or_max in ("min", "max")
@@ -74,6 +73,11 @@ def get_min_max_datetime(min_or_max):
     return dt
 
 
+# decoded once rather than on every gen_custom_triplet() call
+MIN_KSUID_DATETIME = get_min_max_datetime("min")
+MAX_KSUID_DATETIME = get_min_max_datetime("max")
+
+
 def get_min_max_payload_bytes(min_or_max):
     """ Return the min/max possible payload representable with KSUIDs """
 
@@ -133,13 +137,13 @@ def gen_custom_triplet(min_or_max, seconds):
     assert isinstance(seconds, int)
 
     # Get a timestamp second below the epoch
-    extreme_dt = get_min_max_datetime(min_or_max)
+    extreme_dt = MIN_KSUID_DATETIME if min_or_max == "min" else MAX_KSUID_DATETIME
 
     # Offset the datetime
     dt = extreme_dt + timedelta(seconds=seconds)
     
     # Simulate the clipping towards the min or max
-    if (dt < get_min_max_datetime("min")) or (dt > get_min_max_datetime("max")):
+    if (dt < MIN_KSUID_DATETIME) or (dt > MAX_KSUID_DATETIME):
         ts = int(extreme_dt.timestamp())
     else:
         ts = dt.timestamp()
@@ -172,7 +176,8 @@ if __name__ == "__main__":
     for ts_str in timestamps:
         
         # Get a Unix timestamp
-        unix_ts = parse(ts_str).replace(tzinfo=timezone.utc).timestamp()
+        # fromisoformat() is a C fast path but only accepts a trailing 'Z' from Python 3.11
+        unix_ts = datetime.fromisoformat(ts_str.replace("Z", "+00:00")).replace(tzinfo=timezone.utc).timestamp()
 
         # Generate a KSUID
         x = ksuid(timestamp=unix_ts)
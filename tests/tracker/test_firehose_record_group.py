@@ -1,4 +1,3 @@
-from copy import deepcopy
 import orjson
 import pandas as pd
 from ksuid import Ksuid
@@ -21,7 +20,8 @@ def _get_expected_df(json_records):
     df_records = []
 
     for record in json_records:
-        current_record_dict = deepcopy(record)
+        # only top level keys are replaced so a shallow copy is enough
+        current_record_dict = dict(record)
         current_record_dict[fr.DECISION_ID_KEY] = current_record_dict[fr.MESSAGE_ID_KEY]
 
         del current_record_dict[fr.MESSAGE_ID_KEY]
@@ -43,8 +43,7 @@ def test_constructor():
     json_records = []
 
     for _ in range(10):
-        current_record_dict = deepcopy(RECORD_PATTERN)
-        current_record_dict[fr.MESSAGE_ID_KEY] = str(Ksuid())
+        current_record_dict = {**RECORD_PATTERN, fr.MESSAGE_ID_KEY: str(Ksuid())}
 
         records.append(fr.FirehoseRecord(current_record_dict))
         json_records.append(current_record_dict)
@@ -59,8 +58,7 @@ def test_to_pandas_df():
     json_records = []
 
     for _ in range(10):
-        current_record_dict = deepcopy(RECORD_PATTERN)
-        current_record_dict[fr.MESSAGE_ID_KEY] = str(Ksuid())
+        current_record_dict = {**RECORD_PATTERN, fr.MESSAGE_ID_KEY: str(Ksuid())}
 
         records.append(fr.FirehoseRecord(current_record_dict))
         json_records.append(current_record_dict)
@@ -3,6 +3,7 @@ import json
 import numpy as np
 import os
 from pytest import raises
+import weakref
 
 import config
 import firehose_record
@@ -92,6 +93,44 @@ def test_successful_ingest(s3):
     _validate_ingest(s3, expected_keys)
 
 
+def test_ingest_releases_firehose_records_before_processing(s3, mocker):
+    path, records_file, firehose_s3_key_prefix, expected_keys, test_data_dir = \
+        _unpack_ingest_test_case_json(test_case_envar='TEST_CASE_INGEST_JSON')
+    key = _prepare_s3(s3, path, firehose_s3_key_prefix, records_file)
+
+    event = {
+        RECORDS_KEY: [
+            {S3_KEY: {
+                BUCKET_KEY: {NAME_KEY: config.FIREHOSE_BUCKET},
+                OBJECT_KEY: {KEY_KEY: key}
+            }}
+        ]
+    }
+
+    load_groups = firehose_record.FirehoseRecordGroup.load_groups
+    group_refs = []
+
+    def load_groups_tracking_refs(s3_key):
+        groups = load_groups(s3_key)
+        group_refs.extend(weakref.ref(group) for group in groups)
+        return groups
+
+    processed_models = []
+
+    def assert_groups_released(decision_partition):
+        # every FirehoseRecordGroup must already be freed when partitions start processing
+        assert all(group_ref() is None for group_ref in group_refs)
+        processed_models.append(decision_partition.model_name)
+
+    mocker.patch.object(firehose_record.FirehoseRecordGroup, 'load_groups', staticmethod(load_groups_tracking_refs))
+    mocker.patch.object(partition.RewardedDecisionPartition, 'process', assert_groups_released)
+
+    lambda_handler(event, None)
+
+    assert len(group_refs) > 0
+    assert len(processed_models) == len(group_refs)
+
+
 def test_ingest_raises_for_no_records_in_event(s3):
     path, records_file, firehose_s3_key_prefix, expected_keys, test_data_dir = \
         _unpack_ingest_test_case_json(test_case_envar='TEST_CASE_INGEST_JSON')
@@ -0,0 +1,40 @@
+# Built-in imports
+from datetime import datetime, timedelta, timezone
+
+# External imports
+from ksuid import Ksuid
+import pandas as pd
+
+# Local imports
+from utils import are_valid_ksuids, is_valid_ksuid
+
+
+def test_is_valid_ksuid_accepts_past_ksuids():
+    assert is_valid_ksuid(str(Ksuid()))
+    assert is_valid_ksuid(str(Ksuid(datetime=datetime.now(timezone.utc) - timedelta(days=365))))
+
+
+def test_is_valid_ksuid_rejects_future_ksuids():
+    assert not is_valid_ksuid(str(Ksuid(datetime=datetime.now(timezone.utc) + timedelta(minutes=1))))
+
+
+def test_is_valid_ksuid_rejects_malformed_ksuids():
+    for id_ in [None, 1, '', '0' * 26, '0' * 28, '!' * 27]:
+        assert not is_valid_ksuid(id_)
+
+
+def test_are_valid_ksuids_matches_is_valid_ksuid():
+    now = datetime.now(timezone.utc)
+    ids = [str(Ksuid()),
+           str(Ksuid(datetime=now - timedelta(days=365))),
+           str(Ksuid(datetime=now, payload=b'\xff' * 16)),
+           str(Ksuid(datetime=now + timedelta(seconds=2), payload=b'\x00' * 16)),
+           str(Ksuid(datetime=now + timedelta(minutes=1))),
+           '0' * 27, 'z' * 27, 'aWgEPTl1tmebfsQzFP4bxwgy80V', 'aWgEPTl1tmebfsQzFP4bxwgy80W',
+           '', '0' * 26, '0' * 28, '!' * 27]
+
+    expected = [is_valid_ksuid(id_) for id_ in ids]
+    assert are_valid_ksuids(pd.Series(ids)).tolist() == expected
+
+    # non string values fall back to per id validation
+    assert are_valid_ksuids(pd.Series(ids + [None, 1])).tolist() == expected + [False, False]
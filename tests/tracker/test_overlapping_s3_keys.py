@@ -13,7 +13,8 @@ src.ingest.config.TRAIN_BUCKET = os.getenv('TRAIN_BUCKET', None)
 assert src.ingest.config.TRAIN_BUCKET is not None
 
 
-from src.ingest.groom import assert_no_overlapping_keys
+from src.ingest.groom import assert_no_overlapping_keys, group_small_adjacent_partitions, \
+    merge_overlapping_adjacent_group_pairs
 
 
 ALL_OVERLAPPING_S3_KEYS = [
@@ -51,3 +52,24 @@ def test_assert_no_overlapping_keys_raises_for_all_overlapping_keys():
 def test_assert_no_overlapping_keys_raises_for_2_overlapping_keys():
     with raises(AssertionError) as aerr:
         assert_no_overlapping_keys(TWO_OVERLAPPING_S3_KEYS)
+
+
+def test_group_small_adjacent_partitions_respects_max_row_count():
+    s3_keys = sorted(NO_OVERLAPPING_S3_KEYS)
+    # row counts: 200, 10050, 200, 10050
+    groups = list(group_small_adjacent_partitions(s3_keys, max_row_count=10250))
+    assert groups == [s3_keys[:2], s3_keys[2:]]
+
+
+def test_group_small_adjacent_partitions_respects_max_group_size():
+    # row counts: 82, 81, 50, 80
+    groups = list(group_small_adjacent_partitions(ALL_OVERLAPPING_S3_KEYS, max_group_size=3))
+    assert groups == [ALL_OVERLAPPING_S3_KEYS[:3], ALL_OVERLAPPING_S3_KEYS[3:]]
+
+
+def test_merge_overlapping_adjacent_group_pairs_merges_only_overlapping_pairs():
+    s3_keys = sorted(TWO_OVERLAPPING_S3_KEYS)
+    groups = [[s3_key] for s3_key in s3_keys]
+    # the keys ending at 13:51:16, 13:52:46 and 13:55:46 all start at 13:51:06 but only pairs are merged
+    merged_groups = list(merge_overlapping_adjacent_group_pairs(groups))
+    assert merged_groups == [[s3_keys[0]], [s3_keys[1]], s3_keys[2:4], [s3_keys[4]], [s3_keys[5]]]
@@ -1,13 +1,16 @@
+from datetime import datetime, timedelta, timezone
 import gzip
 import numpy as np
 import orjson
 import os
 from pytest import raises
 
+from ksuid import Ksuid
 import pandas as pd
 from firehose_record import DF_SCHEMA, FirehoseRecord, FirehoseRecordGroup, \
     DECISION_ID_KEY, MESSAGE_ID_KEY, COUNT_KEY
-from partition import RewardedDecisionPartition, parquet_s3_key_prefix
+from partition import RewardedDecisionPartition, parquet_s3_key_prefix, parse_iso_8601_basic_timestamp, \
+    maybe_split_on_timestamp_boundaries, decision_id_to_timestamp, ISO_8601_BASIC_FORMAT, DF_COLUMNS
 from tracker.tests_utils import load_ingest_test_case
 
 
@@ -343,3 +346,33 @@ def test__get_group_slicing_indices_raises_for_not_sorted_df():
     p = RewardedDecisionPartition(model_name='dummy-model')
     with raises(AssertionError) as aerr:
         p._get_groups_slices_indices(records=np.array([]))
+
+
+def test_parse_iso_8601_basic_timestamp_matches_strptime():
+    for timestamp in ['20230705T135416Z', '20000101T000000Z', '19991231T235959Z']:
+        assert parse_iso_8601_basic_timestamp(timestamp) == datetime.strptime(timestamp, ISO_8601_BASIC_FORMAT)
+
+
+def test_parse_iso_8601_basic_timestamp_raises_for_invalid_format():
+    for timestamp in ['20230705T135416', '20230705 135416Z', '2023-07-05T13:54:16Z',
+                      '20230705T 35416Z', '2023+705T135416Z', '2023-705T135416Z']:
+        with raises(ValueError):
+            parse_iso_8601_basic_timestamp(timestamp)
+
+
+def test_maybe_split_on_timestamp_boundaries():
+    start = datetime(2022, 1, 31, 23, 59, 0, tzinfo=timezone.utc)
+    # 10 decisions per second spanning a month boundary
+    decision_ids = sorted(str(Ksuid(datetime=start + timedelta(seconds=i // 10))) for i in range(1200))
+    df = pd.DataFrame({DECISION_ID_KEY: decision_ids}, columns=DF_COLUMNS).astype(DF_SCHEMA)
+
+    assert len(maybe_split_on_timestamp_boundaries(df, max_row_count=1200)) == 1
+
+    chunks = maybe_split_on_timestamp_boundaries(df, max_row_count=100)
+    assert all(chunk.shape[0] <= 100 for chunk in chunks)
+    assert all(list(chunk.columns) == DF_COLUMNS for chunk in chunks)
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), df)
+
+    # every chunk is bounded by a timestamp prefix - here a single minute
+    for chunk in chunks:
+        assert chunk[DECISION_ID_KEY].map(lambda x: decision_id_to_timestamp(x)[:13]).nunique() == 1
@@ -3,7 +3,6 @@ import io
 import os
 from pathlib import Path
 import string
-import tempfile
 
 # External imports
 import numpy as np
@@ -30,7 +29,7 @@ from partition import list_partition_s3_keys as list_partitions
 from config import TRAIN_BUCKET
 from firehose_record import DF_SCHEMA
 from tracker.tests_utils import dicts_to_df, get_valid_s3_key_from_df, load_ingest_test_case, \
-    get_model_name_from_env, are_all_s3_keys_valid, _prepare_s3_for_list_partition_tests
+    get_model_name_from_env, are_all_s3_keys_valid, _prepare_s3_for_list_partition_tests, upload_df_as_parquet
 
 
 ENGINE = "fastparquet"
@@ -269,38 +268,23 @@ def test_incorrectly_named_s3_partition(s3, get_rewarded_decision_rec):
 
     invalid_key_prefix = "/".join(get_valid_s3_key_from_df(df=df, model_name=model_name).split("/")[:-2])
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        tmp_path = Path(tmp_dir)
-        # valid_key_prefix = os.sep.join(valid_s3_key.split(os.sep)[:-1])
-        invalid_partition_dir = tmp_path / invalid_key_prefix
-        # make sure parent dir exists
-        invalid_partition_dir.mkdir(parents=True, exist_ok=True)
-        invalid_s3_key_path = invalid_partition_dir / invalid_filename
+    # Upload file with a key that doesn't comply with the expected format
+    invalid_s3_key = invalid_key_prefix + '/' + invalid_filename
+    upload_df_as_parquet(s3, df, TRAIN_BUCKET, invalid_s3_key, ENGINE)
 
-        df.to_parquet(invalid_s3_key_path, engine=ENGINE, index=False)
-
-        # Upload file with a key that doesn't comply with the expected format
-        invalid_s3_key = invalid_key_prefix + '/' + invalid_filename
-        with invalid_s3_key_path.open(mode='rb') as f:
-            s3.upload_fileobj(
-                Fileobj   = f,
-                Bucket    = TRAIN_BUCKET,
-                Key       = invalid_s3_key,
-                ExtraArgs = { 'ContentType': 'application/gzip' })
-
-        # Ensure the key is really there
-        response = s3.list_objects_v2(
-            Bucket = TRAIN_BUCKET,
-            Prefix = f'rewarded_decisions/{model_name}')
-        all_keys = [x['Key'] for x in response['Contents']]
-        assert invalid_s3_key in all_keys
+    # Ensure the key is really there
+    response = s3.list_objects_v2(
+        Bucket = TRAIN_BUCKET,
+        Prefix = f'rewarded_decisions/{model_name}')
+    all_keys = [x['Key'] for x in response['Contents']]
+    assert invalid_s3_key in all_keys
 
-        # Ensure the key is not listed by the function of interest
-        s3_keys = list(list_partitions(model_name=model_name))
-        if len(s3_keys) > 0:
-            assert are_all_s3_keys_valid(s3_keys)
+    # Ensure the key is not listed by the function of interest
+    s3_keys = list(list_partitions(model_name=model_name))
+    if len(s3_keys) > 0:
+        assert are_all_s3_keys_valid(s3_keys)
 
-        assert invalid_s3_key not in list(s3_keys)
+    assert invalid_s3_key not in list(s3_keys)
 
 
 def test_incorrectly_named_s3_partition_in_correct_folder(s3, get_rewarded_decision_rec):
@@ -327,37 +311,23 @@ def test_incorrectly_named_s3_partition_in_correct_folder(s3, get_rewarded_decis
 
     valid_key_prefix = "/".join(get_valid_s3_key_from_df(df=df, model_name=model_name).split("/")[:-1])
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        tmp_path = Path(tmp_dir)
-        valid_partition_dir = tmp_path / valid_key_prefix
-        # make sure parent dir exists
-        valid_partition_dir.mkdir(parents=True, exist_ok=True)
-        invalid_s3_key_path = valid_partition_dir / invalid_filename
-
-        df.to_parquet(invalid_s3_key_path, engine=ENGINE, index=False)
-
-        # Upload file with a key that doesn't comply with the expected format
-        invalid_s3_key = valid_key_prefix + "/" + invalid_filename
-        with invalid_s3_key_path.open(mode='rb') as f:
-            s3.upload_fileobj(
-                Fileobj=f,
-                Bucket=TRAIN_BUCKET,
-                Key=invalid_s3_key,
-                ExtraArgs={'ContentType': 'application/gzip'})
+    # Upload file with a key that doesn't comply with the expected format
+    invalid_s3_key = valid_key_prefix + "/" + invalid_filename
+    upload_df_as_parquet(s3, df, TRAIN_BUCKET, invalid_s3_key, ENGINE)
 
-        # Ensure the key is really there
-        response = s3.list_objects_v2(
-            Bucket=TRAIN_BUCKET,
-            Prefix=f'rewarded_decisions/{model_name}')
-        all_keys = [x['Key'] for x in response['Contents']]
-        assert invalid_s3_key in all_keys
+    # Ensure the key is really there
+    response = s3.list_objects_v2(
+        Bucket=TRAIN_BUCKET,
+        Prefix=f'rewarded_decisions/{model_name}')
+    all_keys = [x['Key'] for x in response['Contents']]
+    assert invalid_s3_key in all_keys
 
-        # Ensure the key is not listed by the function of interest
-        s3_keys = list(list_partitions(model_name=model_name))
-        if len(list(s3_keys)) > 0:
-            assert are_all_s3_keys_valid(s3_keys)
+    # Ensure the key is not listed by the function of interest
+    s3_keys = list(list_partitions(model_name=model_name))
+    if len(list(s3_keys)) > 0:
+        assert are_all_s3_keys_valid(s3_keys)
 
-        assert invalid_s3_key not in list(s3_keys)
+    assert invalid_s3_key not in list(s3_keys)
 
 
 def test_correctly_named_s3_partition(s3, get_rewarded_decision_rec):
@@ -390,27 +360,11 @@ def test_correctly_named_s3_partition(s3, get_rewarded_decision_rec):
         df = dicts_to_df(dicts=[rdr], columns=DF_SCHEMA.keys(), dtypes=DF_SCHEMA)
         valid_key_prefix = "/".join(get_valid_s3_key_from_df(df=df, model_name=model_name).split("/")[:-1])
 
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            tmp_path = Path(tmp_dir)
-            valid_partition_dir = tmp_path / valid_key_prefix
-            # make sure parent dir exists
-            valid_partition_dir.mkdir(parents=True, exist_ok=True)
-            valid_s3_key_path = valid_partition_dir / filename
-
-            # Create a dummy parquet file
-            df.to_parquet(valid_s3_key_path, engine=ENGINE, index=False)
-
-            # model_name = 'messages-2.0'
-            valid_s3_key = valid_key_prefix + "/" + filename
-            assert utils.is_valid_rewarded_decisions_s3_key(valid_s3_key)
-
-            # Upload file with a key that doesn't comply with the expected format
-            with valid_s3_key_path.open(mode='rb') as f:
-                s3.upload_fileobj(
-                    Fileobj=f,
-                    Bucket=TRAIN_BUCKET,
-                    Key=valid_s3_key,
-                    ExtraArgs={'ContentType': 'application/gzip'})
+        # model_name = 'messages-2.0'
+        valid_s3_key = valid_key_prefix + "/" + filename
+        assert utils.is_valid_rewarded_decisions_s3_key(valid_s3_key)
+
+        upload_df_as_parquet(s3, df, TRAIN_BUCKET, valid_s3_key, ENGINE)
 
     # Ensure the key is really there
     response = s3.list_objects_v2(
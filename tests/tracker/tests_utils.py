@@ -1,8 +1,6 @@
 # Built-in imports
 from io import BytesIO
 import os
-from pathlib import Path
-import tempfile
 
 # External imports
 import orjson
@@ -32,8 +30,9 @@ def load_ingest_test_case(test_case_file: str):
 
 def upload_gzipped_records_to_firehose_bucket(s3_client, path, key):
 
-    s3_client.upload_fileobj(
-        Fileobj=BytesIO(open(path, 'rb').read()),
+    # stream the already gzipped file as is rather than copying it into an in-memory buffer first
+    s3_client.upload_file(
+        Filename=str(path),
         Bucket=config.FIREHOSE_BUCKET,
         Key=key,
         ExtraArgs={'ContentType': 'application/gzip'}
@@ -92,21 +91,17 @@ def _prepare_s3_for_list_partition_tests(s3_client, dfs, s3_keys, bucket, engine
         return
 
     for df, s3_key in zip(dfs, s3_keys):
-        # use tempdir
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            tmp_path = Path(tmp_dir)
-            # ensure dir exists
-            (tmp_path / "/".join(s3_key.split("/")[:-1])).mkdir(exist_ok=True, parents=True)
-            s3_key_path = tmp_path / s3_key
-            # cache file to disk before push to moto
-            df.to_parquet(s3_key_path, engine=engine, index=False)
-
-            # assert utils.is_valid_rewarded_decisions_s3_key(s3_key)
-
-            # Upload file with a key that doesn't comply with the expected format
-            with s3_key_path.open(mode='rb') as f:
-                s3_client.upload_fileobj(
-                    Fileobj=f,
-                    Bucket=bucket,
-                    Key=s3_key,
-                    ExtraArgs={'ContentType': 'application/gzip'})
+        upload_df_as_parquet(s3_client, df, bucket, s3_key, engine)
+
+
+def upload_df_as_parquet(s3_client, df, bucket, s3_key, engine):
+    # serialize in memory rather than creating a temp dir and nested parent dirs for every key
+    parquet_buffer = BytesIO()
+    df.to_parquet(parquet_buffer, engine=engine, index=False)
+    parquet_buffer.seek(0)
+
+    s3_client.upload_fileobj(
+        Fileobj=parquet_buffer,
+        Bucket=bucket,
+        Key=s3_key,
+        ExtraArgs={'ContentType': 'application/gzip'})
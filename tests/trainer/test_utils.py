@@ -1,4 +1,4 @@
-from dateutil import parser
+from datetime import datetime
 import orjson
 import os
 
@@ -16,7 +16,8 @@ def get_valid_timestamp(timestamp):
 
     # check string format
     try:
-        parsed_timestamp = parser.isoparse(timestamp)
+        # datetime.fromisoformat() only accepts a trailing 'Z' from Python 3.11
+        parsed_timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
     except ValueError:
         parsed_timestamp = None
 